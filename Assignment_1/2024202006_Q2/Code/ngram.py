@@ -1,9 +1,68 @@
 # ngram.py
 
+import heapq
 import re
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
 import math
 
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; the pure-Python path still works
+    njit = None
+    prange = range
+
+# token pattern over UTF-8 bytes, compiled once
+_TOKEN_RE = re.compile(rb"\S+")
+
+
+def _word_logprob_kernel(buf, n, ngram_keys, ngram_vals, prefix_keys, prefix_vals):
+    """
+    Sum log(count(ngram)/count(prefix)) over every n-byte window of `buf`.
+    Counts live in sorted packed-key arrays, looked up by binary search.
+    Compiled with numba when available; `buf` is the padded word as uint8.
+    """
+    log_prob = 0.0
+    for i in range(buf.shape[0] - n + 1):
+        key = np.uint64(0)
+        for j in range(n):
+            key = (key << np.uint64(8)) | np.uint64(buf[i + j])
+        pkey = key >> np.uint64(8)
+        pi = np.searchsorted(prefix_keys, pkey)
+        if pi >= prefix_keys.shape[0] or prefix_keys[pi] != pkey:
+            return -np.inf
+        ni = np.searchsorted(ngram_keys, key)
+        if ni >= ngram_keys.shape[0] or ngram_keys[ni] != key:
+            return -np.inf
+        log_prob += math.log(ngram_vals[ni] / prefix_vals[pi])
+    return log_prob
+
+
+def _score_words_kernel(word_bytes, lens, n, ngram_keys, ngram_vals, prefix_keys, prefix_vals, out):
+    """
+    Log-probability for every padded word row of `word_bytes` at once.
+    Scoring one word is independent of the others, so the outer loop is a
+    prange: numba fans the rows out across CPU cores.
+    """
+    for c in prange(word_bytes.shape[0]):
+        total = 0.0
+        for i in range(lens[c] - n + 1):
+            key = np.uint64(0)
+            for j in range(n):
+                key = (key << np.uint64(8)) | np.uint64(word_bytes[c, i + j])
+            pi = np.searchsorted(prefix_keys, key >> np.uint64(8))
+            ni = np.searchsorted(ngram_keys, key)
+            total += math.log(ngram_vals[ni] / prefix_vals[pi])
+        out[c] = total
+
+
+if njit is not None:
+    _word_logprob_kernel = njit(cache=True)(_word_logprob_kernel)
+    _score_words_kernel = njit(parallel=True, fastmath=True, cache=True)(_score_words_kernel)
+
 class NgramCharacterModel:
     def __init__(self, corpus, n=3):
 
@@ -11,7 +70,21 @@ class NgramCharacterModel:
         self.ngram_counts = defaultdict(int)
         self.prefix_counts = defaultdict(int)
         self.words = set()
-        
+        self.sorted_words = []
+        self.word_logprob = {}
+
+        # Flat sorted count arrays (packed uint64 keys) for the jitted
+        # scoring kernel; only built when n-grams fit in 8 bytes.
+        self._ngram_keys = None
+        self._ngram_vals = None
+        self._prefix_keys = None
+        self._prefix_vals = None
+
+        # Padded vocabulary as one uint8 matrix (row per word), for the
+        # vectorized whole-vocabulary scoring pass.
+        self._word_bytes = None
+        self._word_lens = None
+
         self._train(corpus)
 
     def _train(self, corpus):
@@ -19,33 +92,206 @@ class NgramCharacterModel:
         Train the n-gram model by populating self.ngram_counts and self.prefix_counts.
         We also store all distinct words in self.words for prefix matching later.
         """
-        # Simple splitting into words (you can refine this if you want)
-        tokens = corpus.split()
-
-        for word in tokens:
-            # store the word for later prefix-based lookups
-            self.words.add(word)
-            
-            # Pad the word with (n-1) start symbols (#) and an end symbol ($)
-            # e.g. for n=2 (bigram): "#word$"
-            #      for n=3 (trigram): "##word$"
-            padded_word = ("#" * (self.n - 1)) + word + "$"
-
-            # Slide over each n-gram in the padded word
-            for i in range(len(padded_word) - self.n + 1):
-                ngram = padded_word[i : i + self.n]     # e.g. "#w", "wo", ...
-                prefix = ngram[:-1]                     # e.g. "#" for bigram, "##" for trigram, etc.
-                
-                self.ngram_counts[ngram] += 1
-                self.prefix_counts[prefix] += 1
+        n = self.n
+        # Tokenize over the UTF-8 bytes with a precompiled pattern: the byte
+        # tokens feed the counting buffer directly, and only the unique
+        # vocabulary is ever decoded back to str.
+        # Build one byte buffer holding every padded word:
+        #   "#"*(n-1) + word + "$"  for each word, as in the original loop.
+        # Padded words are joined by (n-1) 0xFF bytes, which never occur in
+        # UTF-8 text, so any window crossing a word boundary is easy to drop.
+        sep = b"\xff" * max(n - 1, 1)
+        pad = b"#" * (n - 1)
+        parts = []
+        seen = set()
+        for match in _TOKEN_RE.finditer(corpus.encode("utf-8")):
+            token = match.group()
+            seen.add(token)
+            parts.append(pad + token + b"$")
+        if not parts:
+            return
+
+        # store the (unique) words for later prefix-based lookups
+        self.words.update(token.decode("utf-8") for token in seen)
+
+        buf = np.frombuffer(sep.join(parts), dtype=np.uint8)
+
+        # All n-byte windows over the buffer, then keep only the ones that
+        # stay inside a single padded word (no separator byte).
+        windows = sliding_window_view(buf, n)
+        windows = windows[~(windows == 0xFF).any(axis=1)]
+
+        if n <= 8:
+            # Pack each window into one uint64 key so np.unique aggregates
+            # over a flat integer array instead of comparing rows. The count
+            # dicts are keyed by these packed ints directly: hashing a small
+            # int is far cheaper than hashing an n-byte string, and the
+            # prefix key is just the ngram key shifted right by one byte.
+            packed = np.zeros(len(windows), dtype=np.uint64)
+            for j in range(n):
+                packed = (packed << np.uint64(8)) | windows[:, j].astype(np.uint64)
+            keys, counts = np.unique(packed, return_counts=True)
+            for key, count in zip(keys.tolist(), counts.tolist()):
+                self.ngram_counts[key] = count
+                self.prefix_counts[key >> 8] += count
+        else:
+            uniq, counts = np.unique(windows, axis=0, return_counts=True)
+            for row, count in zip(uniq, counts.tolist()):
+                ngram = row.tobytes()
+                self.ngram_counts[ngram] = count
+                self.prefix_counts[ngram[:-1]] += count
+
+        # Keep a sorted copy of the vocabulary so prefix matching can use
+        # binary search instead of scanning every word.
+        self.sorted_words = sorted(self.words)
+
+        # Flatten the count dicts into sorted packed-key arrays so scoring
+        # can run in the compiled kernel (dict lookups don't jit).
+        if n <= 8:
+            ngram_items = sorted(self.ngram_counts.items())
+            prefix_items = sorted(self.prefix_counts.items())
+            self._ngram_keys = np.array([k for k, _ in ngram_items], dtype=np.uint64)
+            self._ngram_vals = np.array([v for _, v in ngram_items], dtype=np.int64)
+            self._prefix_keys = np.array([k for k, _ in prefix_items], dtype=np.uint64)
+            self._prefix_vals = np.array([v for _, v in prefix_items], dtype=np.int64)
+
+        # The counts are frozen from here on, so each word's log-probability
+        # is a constant. Score every word once now so ranking candidates
+        # later is just a dict lookup instead of a rescoring loop.
+        if self._ngram_keys is not None:
+            self._score_vocabulary()
+        else:
+            for word in self.words:
+                self.word_logprob[word] = self._word_logprob(word)
+
+    def _score_vocabulary(self):
+        """
+        Compute log-probabilities for the whole vocabulary in one vectorized
+        pass: pack every padded word into a row of a uint8 matrix, take
+        n-byte sliding windows, look the counts up with searchsorted and sum
+        the logs along each row. One NumPy kernel instead of |V| Python loops.
+        """
+        n = self.n
+        padded = [b"#" * (n - 1) + w.encode("utf-8") + b"$" for w in self.sorted_words]
+        lens = np.array([len(p) for p in padded], dtype=np.int64)
+        word_bytes = np.zeros((len(padded), int(lens.max())), dtype=np.uint8)
+        for i, p in enumerate(padded):
+            word_bytes[i, : len(p)] = np.frombuffer(p, dtype=np.uint8)
+        self._word_bytes = word_bytes
+        self._word_lens = lens
+
+        if njit is not None:
+            # parallel compiled kernel: one prange iteration per word
+            totals = np.empty(len(padded), dtype=np.float64)
+            _score_words_kernel(
+                word_bytes, lens, n,
+                self._ngram_keys, self._ngram_vals,
+                self._prefix_keys, self._prefix_vals,
+                totals,
+            )
+            self.word_logprob = dict(zip(self.sorted_words, totals.tolist()))
+            return
+
+        # (|V|, W, n) windows -> (|V|, W) packed uint64 keys
+        windows = sliding_window_view(word_bytes, n, axis=1)
+        packed = np.zeros(windows.shape[:2], dtype=np.uint64)
+        for j in range(n):
+            packed = (packed << np.uint64(8)) | windows[..., j].astype(np.uint64)
+
+        # Windows past each word's padded length are garbage; mask them out.
+        valid = np.arange(packed.shape[1])[None, :] < (lens[:, None] - n + 1)
+
+        ni = np.clip(np.searchsorted(self._ngram_keys, packed), 0, len(self._ngram_keys) - 1)
+        pi = np.clip(
+            np.searchsorted(self._prefix_keys, packed >> np.uint64(8)),
+            0, len(self._prefix_keys) - 1,
+        )
+        logs = np.log(self._ngram_vals[ni] / self._prefix_vals[pi])
+        totals = np.where(valid, logs, 0.0).sum(axis=1)
+        self.word_logprob = dict(zip(self.sorted_words, totals.tolist()))
+
+    def _word_logprob(self, word):
+        """
+        Log-probability of `word` under the model (same formula as
+        `_word_probability`, but kept in log space).
+        """
+        # counts are kept over UTF-8 bytes, so pad and encode the same way
+        padded_word = b"#" * (self.n - 1) + word.encode("utf-8") + b"$"
+
+        if self._ngram_keys is not None:
+            buf = np.frombuffer(padded_word, dtype=np.uint8)
+            return float(
+                _word_logprob_kernel(
+                    buf, self.n,
+                    self._ngram_keys, self._ngram_vals,
+                    self._prefix_keys, self._prefix_vals,
+                )
+            )
+
+        if self.n <= 8:
+            # dicts are keyed by packed ints; build the key with shift+mask
+            mask = (1 << (8 * self.n)) - 1
+            key = 0
+            log_prob = 0.0
+            for i, byte in enumerate(padded_word):
+                key = ((key << 8) | byte) & mask
+                if i < self.n - 1:
+                    continue
+                count_prefix = self.prefix_counts[key >> 8]
+                if count_prefix == 0:
+                    return float("-inf")
+                log_prob += math.log(self.ngram_counts[key] / count_prefix)
+            return log_prob
+
+        log_prob = 0.0
+        for i in range(len(padded_word) - self.n + 1):
+            ngram = padded_word[i : i + self.n]
+            prefix = ngram[:-1]
+            count_prefix = self.prefix_counts[prefix]
+            if count_prefix == 0:
+                return float("-inf")
+            log_prob += math.log(self.ngram_counts[ngram] / count_prefix)
+        return log_prob
+
+    def prefix_candidates(self, prefix):
+        """
+        Return all known words starting with `prefix` using binary search over
+        the sorted vocabulary: O(log|V| + k) instead of O(|V|) per lookup.
+        """
+        lo = bisect_left(self.sorted_words, prefix)
+        hi = bisect_right(self.sorted_words, prefix + "\uffff")
+        return self.sorted_words[lo:hi]
 
     def _word_probability(self, word):
         """
         Compute the probability of an entire word using the character-level n-gram model.
         P(word) = product of P(each character | its (n-1)-character prefix)
         """
-        # Pad the word similarly as in training
-        padded_word = ("#" * (self.n - 1)) + word + "$"
+        # Every vocabulary word is already scored once at training time, and
+        # candidates sharing a typed prefix share that cached score's prefix
+        # term, so known words never re-walk their characters here.
+        cached = self.word_logprob.get(word)
+        if cached is not None:
+            return math.exp(cached)
+
+        # Pad the word similarly as in training (counts use UTF-8 bytes)
+        padded_word = b"#" * (self.n - 1) + word.encode("utf-8") + b"$"
+
+        if self.n <= 8:
+            # dicts are keyed by packed ints; build the key with shift+mask
+            mask = (1 << (8 * self.n)) - 1
+            key = 0
+            log_prob = 0.0
+            for i, byte in enumerate(padded_word):
+                key = ((key << 8) | byte) & mask
+                if i < self.n - 1:
+                    continue
+                count_prefix = self.prefix_counts[key >> 8]
+                if count_prefix == 0:
+                    # If prefix wasn't seen, probability is extremely low.
+                    return 0.0
+                log_prob += math.log(self.ngram_counts[key] / count_prefix)
+            return math.exp(log_prob)
 
         log_prob = 0.0  # we'll use log probabilities to avoid underflow
         for i in range(len(padded_word) - self.n + 1):
@@ -72,23 +318,25 @@ class NgramCharacterModel:
         Uses the n-gram probability to pick the best match among known words.
         """
         # Filter words that start with the given prefix
-        candidates = [w for w in self.words if w.startswith(prefix)]
+        candidates = self.prefix_candidates(prefix)
         if not candidates:
             return prefix  # if no known word starts with prefix, just return the prefix as-is
 
         # Pick the candidate with the highest n-gram probability
-        best_word = max(candidates, key=self._word_probability)
+        best_word = max(candidates, key=self.word_logprob.__getitem__)
         return best_word
 
-    def predict_top_words(self, prefix, top_k=10):
+    def predict_top_words(self, prefix, top_k=10, candidates=None):
         """
         Returns the top_k most probable completions from the training corpus that start with `prefix`.
+        Callers that already hold the matching candidate list (e.g. narrowed
+        incrementally from a previous keystroke) can pass it in to skip the lookup.
         """
         # Filter words by prefix
-        candidates = [w for w in self.words if w.startswith(prefix)]
+        if candidates is None:
+            candidates = self.prefix_candidates(prefix)
         if not candidates:
             return []
 
-        # Sort candidates by probability in descending order
-        candidates.sort(key=self._word_probability, reverse=True)
-        return candidates[:top_k]
+        # Partial top-k selection: O(N log k) instead of sorting all N candidates
+        return heapq.nlargest(top_k, candidates, key=self.word_logprob.__getitem__)
@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 
 import curses
-import re
 import sys
 import os
 from typing import List
@@ -20,6 +19,10 @@ class TerminalUI:
         self.current_suggestion_idx = 0
         self.scores = []
         self.text_content = text_content if text_content else ""
+        # The text content never changes after init, so split it once and
+        # memoize the wrapped lines per panel width.
+        self._text_words = self.text_content.split()
+        self._wrap_cache = {}
         self.user_input = ""
         self.cursor_pos = 0
         self.cursor_row = 1
@@ -31,10 +34,43 @@ class TerminalUI:
 
         self.prediction_model = prediction_model
 
+        # Cache of the last queried prefix so cursor moves inside the same
+        # word don't trigger a fresh vocabulary lookup. The full candidate
+        # list (not just top-k) is kept so typing one more character can
+        # narrow it instead of re-querying the whole vocabulary.
+        self._last_prefix = None
+        self._last_suggestions = []
+        self._cached_candidates = []
+
         # Metric counters
         self.total_letter_keys_typed = 0
         self.total_tab_key_presses = 0
 
+        # Number of words in user_input, maintained incrementally in
+        # handle_input so the scores don't need to re-split the whole
+        # input on every keystroke.
+        self._word_count = 0
+
+        # Per-panel dirty flags: handle_input marks what changed and the
+        # main loop only redraws those panels.
+        self._dirty = {"suggestions": True, "text": True, "input": True, "scores": True}
+
+        # Dispatch table for ASCII keys: one indexed call instead of an
+        # if/elif compare chain per keystroke. Curses KEY_* constants are
+        # >= 256 and handled separately in handle_input.
+        self._key_handlers = [self._handle_other] * 128
+        self._key_handlers[9] = self._handle_tab
+        self._key_handlers[10] = self._handle_enter
+        self._key_handlers[27] = self._handle_escape
+        for code in (8, 127):
+            self._key_handlers[code] = self._handle_backspace
+        for code in range(32, 127):
+            self._key_handlers[code] = self._handle_printable
+
+    def _mark_dirty(self, *panels) -> None:
+        for panel in panels:
+            self._dirty[panel] = True
+
     def calculate_scores(self, text: str) -> List[float]:
         """
         Calculate and return:
@@ -43,8 +79,7 @@ class TerminalUI:
           3) Average letters per word
           4) Average Tab presses per word
         """
-        words = text.strip().split()
-        num_words = len(words)
+        num_words = self._word_count
         if num_words > 0:
             avg_letters = self.total_letter_keys_typed / num_words
             avg_tabs = self.total_tab_key_presses / num_words
@@ -61,19 +96,45 @@ class TerminalUI:
 
     def find_last_word_start(self, text: str, cursor_pos: int) -> int:
         """Find the start position of the last word being typed."""
-        if cursor_pos == 0:
-            return 0
-        text_before_cursor = text[:cursor_pos]
-        match = re.search(r"[^\s]*$", text_before_cursor)
-        if match:
-            return cursor_pos - len(match.group(0))
-        return cursor_pos
+        # Plain reverse scan for the last whitespace; cheaper than firing up
+        # the regex engine on every keystroke.
+        i = cursor_pos
+        while i > 0 and not text[i - 1].isspace():
+            i -= 1
+        return i
 
     def get_current_word(self) -> str:
         """Return the current word being typed."""
         word_start = self.find_last_word_start(self.user_input, self.cursor_pos)
         return self.user_input[word_start:self.cursor_pos]
 
+    def update_suggestions(self) -> None:
+        """Refresh suggestions for the current word, reusing the cached
+        result when the prefix hasn't changed (e.g. arrow-key moves)."""
+        current_word = self.get_current_word()
+        if current_word != self._last_prefix:
+            if (
+                self._last_prefix is not None
+                and len(current_word) == len(self._last_prefix) + 1
+                and current_word.startswith(self._last_prefix)
+            ):
+                # The prefix grew by one character, so the new candidate set
+                # is a subset of the cached one: filter instead of re-querying.
+                pos = len(current_word) - 1
+                char = current_word[pos]
+                self._cached_candidates = [
+                    w for w in self._cached_candidates
+                    if len(w) > pos and w[pos] == char
+                ]
+            else:
+                self._cached_candidates = self.prediction_model.prefix_candidates(current_word)
+            self._last_suggestions = self.prediction_model.predict_top_words(
+                current_word, candidates=self._cached_candidates
+            )
+            self._last_prefix = current_word
+        self.suggestions = self._last_suggestions
+        self.current_suggestion_idx = 0
+
     def replace_current_word(self, new_word: str) -> None:
         """Replace the current word with a suggestion."""
         word_start = self.find_last_word_start(self.user_input, self.cursor_pos)
@@ -83,6 +144,9 @@ class TerminalUI:
             + self.user_input[self.cursor_pos:]
         )
         self.cursor_pos = word_start + len(new_word)
+        # Word replacement can splice words arbitrarily; recount here since
+        # it only happens on ENTER, not per keystroke.
+        self._word_count = len(self.user_input.split())
 
     def draw_suggestions_panel(self) -> None:
         """Draw the suggestions panel (top panel)."""
@@ -93,12 +157,13 @@ class TerminalUI:
         if not self.suggestions:
             self.suggestions_panel.addstr(1, 2, "No suggestions")
         else:
-            display_text = ""
+            parts = []
             for i, suggestion in enumerate(self.suggestions):
                 if i == self.current_suggestion_idx:
-                    display_text += f"[{suggestion}] "
+                    parts.append(f"[{suggestion}]")
                 else:
-                    display_text += f"{suggestion} "
+                    parts.append(suggestion)
+            display_text = " ".join(parts)
             if len(display_text) > w - 4:
                 display_text = display_text[:w - 7] + "..."
             self.suggestions_panel.addstr(1, 2, display_text)
@@ -110,17 +175,27 @@ class TerminalUI:
         self.text_panel.erase()
         self.text_panel.box()
         self.text_panel.addstr(0, 2, " Text Content ")
-        words = self.text_content.split()
-        lines = []
-        current_line = ""
-        for word in words:
-            if len(current_line + " " + word) > w - 4:
-                lines.append(current_line)
-                current_line = word
-            else:
-                current_line = current_line + " " + word if current_line else word
-        if current_line:
-            lines.append(current_line)
+        lines = self._wrap_cache.get(w)
+        if lines is None:
+            # Build each line as a list of words and join once; repeated
+            # string += reallocates the line on every word.
+            lines = []
+            current_parts = []
+            current_len = 0
+            for word in self._text_words:
+                if current_len + 1 + len(word) > w - 4:
+                    lines.append(" ".join(current_parts))
+                    current_parts = [word]
+                    current_len = len(word)
+                elif current_parts:
+                    current_parts.append(word)
+                    current_len += 1 + len(word)
+                else:
+                    current_parts = [word]
+                    current_len = len(word)
+            if current_parts:
+                lines.append(" ".join(current_parts))
+            self._wrap_cache[w] = lines
         for i, line in enumerate(lines):
             if i < h - 2:
                 self.text_panel.addstr(i + 1, 2, line)
@@ -197,60 +272,103 @@ class TerminalUI:
 
     def handle_input(self, key) -> bool:
         """Handle key input and update metrics."""
+        if 0 <= key < 128:
+            return self._key_handlers[key](key)
+        # curses special keys are >= 256 and stay outside the table
         if key == curses.KEY_RESIZE:
+            self._mark_dirty("suggestions", "text", "input", "scores")
             return True
-        if key == 27:  # ESC
-            return False
-        if key == 9:  # TAB
-            if self.suggestions:
-                self.current_suggestion_idx = (self.current_suggestion_idx + 1) % len(self.suggestions)
-            self.total_tab_key_presses += 1
-            return True
-        if key == 10:  # ENTER
-            if self.suggestions and self.current_suggestion_idx < len(self.suggestions):
-                self.replace_current_word(self.suggestions[self.current_suggestion_idx])
-                self.suggestions = []
-                self.current_suggestion_idx = 0
-            return True
-        if key in (curses.KEY_BACKSPACE, 127, 8):
-            if self.cursor_pos > 0:
-                self.user_input = (
-                    self.user_input[:self.cursor_pos - 1]
-                    + self.user_input[self.cursor_pos:]
-                )
-                self.cursor_pos -= 1
-                current_word = self.get_current_word()
-                self.suggestions = self.prediction_model.predict_top_words(current_word)
-                self.current_suggestion_idx = 0
-                self.scores = self.calculate_scores(self.user_input)
-            return True
+        if key == curses.KEY_BACKSPACE:
+            return self._handle_backspace(key)
         if key == curses.KEY_LEFT:
-            if self.cursor_pos > 0:
-                self.cursor_pos -= 1
-                current_word = self.get_current_word()
-                self.suggestions = self.prediction_model.predict_top_words(current_word)
-                self.current_suggestion_idx = 0
-            return True
+            return self._handle_left(key)
         if key == curses.KEY_RIGHT:
-            if self.cursor_pos < len(self.user_input):
-                self.cursor_pos += 1
-                current_word = self.get_current_word()
-                self.suggestions = self.prediction_model.predict_top_words(current_word)
-                self.current_suggestion_idx = 0
-            return True
-        if 32 <= key <= 126:
-            char = chr(key)
-            self.total_letter_keys_typed += 1
+            return self._handle_right(key)
+        return True
+
+    def _handle_other(self, key) -> bool:
+        return True
+
+    def _handle_escape(self, key) -> bool:
+        return False
+
+    def _handle_tab(self, key) -> bool:
+        if self.suggestions:
+            self.current_suggestion_idx = (self.current_suggestion_idx + 1) % len(self.suggestions)
+        self.total_tab_key_presses += 1
+        self._mark_dirty("suggestions")
+        return True
+
+    def _handle_enter(self, key) -> bool:
+        if self.suggestions and self.current_suggestion_idx < len(self.suggestions):
+            self.replace_current_word(self.suggestions[self.current_suggestion_idx])
+            self.suggestions = []
+            self.current_suggestion_idx = 0
+            self._last_prefix = None
+            self._last_suggestions = []
+            self._cached_candidates = []
+            self._mark_dirty("suggestions", "input")
+        return True
+
+    def _handle_backspace(self, key) -> bool:
+        if self.cursor_pos > 0:
+            pos = self.cursor_pos
+            removed = self.user_input[pos - 1]
+            left_space = pos <= 1 or self.user_input[pos - 2].isspace()
+            right_space = pos == len(self.user_input) or self.user_input[pos].isspace()
+            if removed.isspace():
+                # deleting the gap between two words merges them
+                if not left_space and not right_space:
+                    self._word_count -= 1
+            elif left_space and right_space:
+                # deleting the last character of a word removes it
+                self._word_count -= 1
             self.user_input = (
-                self.user_input[:self.cursor_pos]
-                + char
+                self.user_input[:self.cursor_pos - 1]
                 + self.user_input[self.cursor_pos:]
             )
-            self.cursor_pos += 1
-            current_word = self.get_current_word()
-            self.suggestions = self.prediction_model.predict_top_words(current_word)
-            self.current_suggestion_idx = 0
+            self.cursor_pos -= 1
+            self.update_suggestions()
             self.scores = self.calculate_scores(self.user_input)
+            self._mark_dirty("suggestions", "input", "scores")
+        return True
+
+    def _handle_left(self, key) -> bool:
+        if self.cursor_pos > 0:
+            self.cursor_pos -= 1
+            self.update_suggestions()
+            self._mark_dirty("suggestions", "input")
+        return True
+
+    def _handle_right(self, key) -> bool:
+        if self.cursor_pos < len(self.user_input):
+            self.cursor_pos += 1
+            self.update_suggestions()
+            self._mark_dirty("suggestions", "input")
+        return True
+
+    def _handle_printable(self, key) -> bool:
+        char = chr(key)
+        self.total_letter_keys_typed += 1
+        pos = self.cursor_pos
+        left_space = pos == 0 or self.user_input[pos - 1].isspace()
+        right_space = pos == len(self.user_input) or self.user_input[pos].isspace()
+        if char.isspace():
+            # a space in the middle of a word splits it in two
+            if not left_space and not right_space:
+                self._word_count += 1
+        elif left_space and right_space:
+            # a letter surrounded by whitespace starts a new word
+            self._word_count += 1
+        self.user_input = (
+            self.user_input[:self.cursor_pos]
+            + char
+            + self.user_input[self.cursor_pos:]
+        )
+        self.cursor_pos += 1
+        self.update_suggestions()
+        self.scores = self.calculate_scores(self.user_input)
+        self._mark_dirty("suggestions", "input", "scores")
         return True
 
     def run(self) -> None:
@@ -276,6 +394,7 @@ class TerminalUI:
             self.draw_text_panel()
             self.draw_input_panel()
             self.draw_scores_panel()
+            self._dirty = dict.fromkeys(self._dirty, False)
 
             # Try to move the cursor to a safe starting position.
             try:
@@ -307,14 +426,32 @@ class TerminalUI:
                     text_height = (max_y - 6) // 2 + 2
                     input_height = (max_y - 6) // 2 + 1
                     scores_height = 3
-                    self.suggestions_panel = curses.newwin(suggestions_height, max_x, 0, 0)
-                    self.text_panel = curses.newwin(text_height, max_x, suggestions_height, 0)
-                    self.input_panel = curses.newwin(input_height, max_x, suggestions_height + text_height, 0)
-                    self.scores_panel = curses.newwin(scores_height, max_x, suggestions_height + text_height + input_height, 0)
-                self.draw_suggestions_panel()
-                self.draw_text_panel()
-                self.draw_input_panel()
-                self.draw_scores_panel()
+                    # Resize/move the existing windows in place; allocating
+                    # four fresh ones per event churns memory during resize
+                    # storms (dragging a corner fires dozens per second).
+                    try:
+                        self.suggestions_panel.resize(suggestions_height, max_x)
+                        self.suggestions_panel.mvwin(0, 0)
+                        self.text_panel.resize(text_height, max_x)
+                        self.text_panel.mvwin(suggestions_height, 0)
+                        self.input_panel.resize(input_height, max_x)
+                        self.input_panel.mvwin(suggestions_height + text_height, 0)
+                        self.scores_panel.resize(scores_height, max_x)
+                        self.scores_panel.mvwin(suggestions_height + text_height + input_height, 0)
+                    except curses.error:
+                        pass
+                if self._dirty["suggestions"]:
+                    self.draw_suggestions_panel()
+                    self._dirty["suggestions"] = False
+                if self._dirty["text"]:
+                    self.draw_text_panel()
+                    self._dirty["text"] = False
+                if self._dirty["input"]:
+                    self.draw_input_panel()
+                    self._dirty["input"] = False
+                if self._dirty["scores"]:
+                    self.draw_scores_panel()
+                    self._dirty["scores"] = False
                 try:
                     self.input_panel.move(self.cursor_row, self.cursor_col)
                     self.input_panel.noutrefresh()
@@ -345,12 +482,18 @@ if __name__ == "__main__":
         with open(corpus_arg, "r", encoding="utf-8") as file:
             corpus = file.read()
     else:
-        corpus_file_path_list = sorted(os.listdir(corpus_arg))
-        corpus_file_path_list = [os.path.join(corpus_arg, fname) for fname in corpus_file_path_list if fname.endswith(".txt")]
-        corpus = ""
+        with os.scandir(corpus_arg) as entries:
+            corpus_file_path_list = sorted(
+                entry.path for entry in entries
+                if entry.name.endswith(".txt") and entry.is_file()
+            )
+        # collect the chunks and join once; += would recopy the growing
+        # corpus string for every file
+        corpus_parts = []
         for path in corpus_file_path_list:
             with open(path, "r", encoding="utf-8") as file:
-                corpus += file.read()
+                corpus_parts.append(file.read())
+        corpus = "".join(corpus_parts)
 
     # Optionally read text content for the Text Content panel
     text_data = ""
@@ -1,29 +1,79 @@
 # save this as capture_images.py
 
-import cv2, os, time, argparse
+import cv2, os, time, argparse, queue, threading
+
+try:
+    # libjpeg-turbo's SIMD encoder is several times faster than the
+    # default cv2.imwrite path when the binding is installed
+    from turbojpeg import TurboJPEG
+    _turbo = TurboJPEG()
+except Exception:
+    _turbo = None
+
+def save_jpeg(fname, frame, quality=85):
+    """Encode `frame` as JPEG and write it to `fname`."""
+    if _turbo is not None:
+        data = _turbo.encode(frame, quality=quality)
+    else:
+        ok, buf = cv2.imencode(
+            ".jpg", frame,
+            # fixed quality, no extra optimization pass over the huffman tables
+            [cv2.IMWRITE_JPEG_QUALITY, quality, cv2.IMWRITE_JPEG_OPTIMIZE, 0],
+        )
+        if not ok:
+            raise RuntimeError(f"JPEG encode failed for {fname}")
+        data = buf.tobytes()
+    with open(fname, "wb") as f:
+        f.write(data)
 
 def capture_images(output_dir, count=100, delay=1.0, cam_index=0):
     """
-    Capture `count` frames from webcam `cam_index`, 
+    Capture `count` frames from webcam `cam_index`,
     saving one image every `delay` seconds into `output_dir`.
+    A reader thread keeps draining the camera while the main thread
+    encodes and writes, so camera I/O overlaps JPEG encode + disk I/O.
     """
     os.makedirs(output_dir, exist_ok=True)
     cap = cv2.VideoCapture(cam_index)
     if not cap.isOpened():
         raise RuntimeError(f"Cannot open camera {cam_index}")
+    # keep at most one frame buffered so grabs are always fresh
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
 
     print(f"Starting capture: {count} images → {output_dir}")
-    for i in range(count):
-        ret, frame = cap.read()
-        if not ret:
-            print("  ✗ Frame grab failed, stopping.")
+    frames = queue.Queue(maxsize=2)
+
+    def grab_frames():
+        # Read continuously and hand over one frame per `delay`, using
+        # monotonic deadlines so encode/write time doesn't stretch the
+        # interval the way read + sleep did.
+        next_due = time.monotonic()
+        grabbed = 0
+        while grabbed < count:
+            ret, frame = cap.read()
+            if not ret:
+                print("  ✗ Frame grab failed, stopping.")
+                break
+            if time.monotonic() >= next_due:
+                frames.put((grabbed, frame))
+                grabbed += 1
+                next_due += delay
+        frames.put(None)  # tell the writer we're done
+
+    grabber = threading.Thread(target=grab_frames, daemon=True)
+    grabber.start()
+
+    while True:
+        item = frames.get()
+        if item is None:
             break
+        i, frame = item
         timestamp = int(time.time()*1000)
         fname = os.path.join(output_dir, f"img_{timestamp}_{i:03d}.jpg")
-        cv2.imwrite(fname, frame)
+        save_jpeg(fname, frame)
         print(f"  ✓ Saved {fname}")
-        time.sleep(delay)
 
+    grabber.join()
     cap.release()
     print("Capture complete.")
 